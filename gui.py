@@ -1,4 +1,5 @@
-﻿import os
+﻿import json
+import os
 import queue
 import subprocess
 import sys
@@ -9,7 +10,11 @@ from pathlib import Path
 from typing import Optional
 
 BASE_DIR = Path(__file__).resolve().parent
-RUN_SCRIPT = BASE_DIR / "run.py"
+WORKER_SCRIPT = BASE_DIR / "worker.py"
+POLL_ACTIVE_MS = 20    # re-poll quickly while output is flowing
+POLL_IDLE_MS = 250     # back off when the queue was empty
+READ_CHUNK_SIZE = 65536
+MAX_LOG_LINES = 5000   # older lines are dropped so the Text widget stays small
 
 
 class AnalyzerGUI:
@@ -17,7 +22,8 @@ class AnalyzerGUI:
         self.root = root
         self.root.title("Audio Rubric Runner")
         self.audio_path: Optional[str] = None
-        self.process_thread: Optional[threading.Thread] = None
+        self.worker: Optional[subprocess.Popen] = None
+        self.reader_thread: Optional[threading.Thread] = None
         self.running = False
         self.output_queue: queue.Queue = queue.Queue()
 
@@ -47,7 +53,9 @@ class AnalyzerGUI:
         self.log_text.configure(font=("Consolas", 10))
         self.log_text.pack(fill="both", expand=True, padx=12, pady=(0, 12))
 
-        self.root.after(100, self._poll_queue)
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+        self.root.after(POLL_IDLE_MS, self._poll_queue)
+        self._start_worker()
 
     def select_file(self) -> None:
         path = filedialog.askopenfilename(
@@ -60,8 +68,8 @@ class AnalyzerGUI:
             self.run_button.config(state="normal")
 
     def run_analysis(self) -> None:
-        if not RUN_SCRIPT.exists():
-            messagebox.showerror("Missing Script", f"Could not find run.py at {RUN_SCRIPT}")
+        if not WORKER_SCRIPT.exists():
+            messagebox.showerror("Missing Script", f"Could not find worker.py at {WORKER_SCRIPT}")
             return
         if not self.audio_path:
             messagebox.showwarning("No Audio", "Please select an audio file first.")
@@ -71,51 +79,117 @@ class AnalyzerGUI:
         if not os.path.exists(self.audio_path):
             messagebox.showerror("File Missing", "The selected audio file no longer exists.")
             return
+        if not self._worker_alive() and not self._start_worker():
+            return
 
         self.log_text.delete("1.0", tk.END)
         self.running = True
         self.run_button.config(state="disabled")
 
-        self.process_thread = threading.Thread(target=self._run_process, daemon=True)
-        self.process_thread.start()
+        assert self.worker is not None and self.worker.stdin is not None
+        try:
+            self.worker.stdin.write((json.dumps({"audio": self.audio_path}) + "\n").encode("ascii"))
+            self.worker.stdin.flush()
+        except OSError:
+            self.output_queue.put("Lost connection to the analysis worker; click Run to restart it.\n")
+            self.output_queue.put(None)
 
-    def _run_process(self) -> None:
-        cmd = [sys.executable, "run.py", "--audio", self.audio_path]
+    def close(self) -> None:
+        if self._worker_alive():
+            assert self.worker is not None and self.worker.stdin is not None
+            try:
+                self.worker.stdin.close()  # worker exits when its stdin reaches EOF
+            except OSError:
+                pass
+        self.root.destroy()
+
+    def _worker_alive(self) -> bool:
+        return self.worker is not None and self.worker.poll() is None
+
+    def _start_worker(self) -> bool:
+        """Launch worker.py once; it keeps imports and the OpenAI client warm between runs."""
+        cmd = [sys.executable, "-u", str(WORKER_SCRIPT)]
+        env = dict(os.environ, PYTHONIOENCODING="utf-8")  # non-event output is decoded as UTF-8
         try:
-            process = subprocess.Popen(
+            self.worker = subprocess.Popen(
                 cmd,
                 cwd=BASE_DIR,
+                stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
+                bufsize=-1,
+                env=env,
             )
         except FileNotFoundError:
             self.output_queue.put("Failed to start python interpreter.\n")
-            self.output_queue.put(None)
-            return
+            return False
+
+        self.reader_thread = threading.Thread(target=self._read_worker, args=(self.worker,), daemon=True)
+        self.reader_thread.start()
+        return True
 
+    def _read_worker(self, process: subprocess.Popen) -> None:
         assert process.stdout is not None
-        for line in process.stdout:
-            self.output_queue.put(line)
+        # Read raw 64 KiB chunks and split the JSON-lines protocol here, off the Tk thread.
+        fd = process.stdout.fileno()
+        pending = b""
+        while chunk := os.read(fd, READ_CHUNK_SIZE):
+            *lines, pending = (pending + chunk).split(b"\n")
+            for line in lines:
+                self._handle_worker_line(line)
+        if pending:
+            self._handle_worker_line(pending)
         return_code = process.wait()
-        self.output_queue.put(f"\n[process] Finished with exit code {return_code}\n")
-        self.output_queue.put(None)
+        if self.running:
+            self.output_queue.put(f"\n[worker] Exited unexpectedly with code {return_code}\n")
+            self.output_queue.put(None)
+
+    def _handle_worker_line(self, line: bytes) -> None:
+        try:
+            event = json.loads(line)
+        except ValueError:
+            event = None
+        if not isinstance(event, dict):
+            # e.g. an import error printed before the worker could start its event loop
+            self.output_queue.put(line.rstrip(b"\r").decode("utf-8", errors="replace") + "\n")
+            return
+        kind = event.get("event")
+        if kind == "output":
+            self.output_queue.put(event.get("text", ""))
+        elif kind == "done":
+            self.output_queue.put(f"\n[process] Finished with exit code {event.get('exit_code')}\n")
+            self.output_queue.put(None)
+        elif kind == "ready":
+            self.output_queue.put("[worker] Ready.\n")
 
     def _poll_queue(self) -> None:
+        # Drain everything queued, then do a single insert/see so Tk redraws once per batch.
+        messages = []
+        finished = False
         try:
             while True:
                 message = self.output_queue.get_nowait()
                 if message is None:
-                    self.running = False
-                    self.run_button.config(state="normal")
+                    finished = True
                     break
-                self.log_text.insert(tk.END, message)
-                self.log_text.see(tk.END)
+                messages.append(message)
         except queue.Empty:
             pass
         finally:
-            self.root.after(100, self._poll_queue)
+            if messages:
+                self.log_text.insert(tk.END, "".join(messages))
+                self._trim_log()
+                self.log_text.see(tk.END)
+            if finished:
+                self.running = False
+                self.run_button.config(state="normal")
+            delay = POLL_ACTIVE_MS if messages or finished else POLL_IDLE_MS
+            self.root.after(delay, self._poll_queue)
+
+    def _trim_log(self) -> None:
+        lines = int(self.log_text.index("end-1c").split(".")[0])
+        if lines > MAX_LOG_LINES:
+            self.log_text.delete("1.0", f"{lines - MAX_LOG_LINES + 1}.0")
 
 
 def main() -> None:
@@ -1,32 +1,115 @@
-import os, base64, pathlib, sys, json, re, datetime, argparse
+import os, base64, hashlib, importlib.util, pathlib, shutil, subprocess, sys, json, re, threading, argparse
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Tuple
-from openai import OpenAI
+import httpx
+from openai import DefaultHttpxClient, OpenAI
+
+try:
+    import pybase64 as b64codec  # SIMD-accelerated; same API as stdlib base64
+except ImportError:
+    b64codec = base64
+
+try:
+    import orjson  # Rust JSON parser/serializer; much faster on large model outputs
+except ImportError:
+    orjson = None
 
 # ========= CONFIG =========
 MODEL = "gpt-audio-2025-08-28"   # audio-capable chat model
 AUDIO_PATH = "20251023-221732_Covan_Magee_fb59efc8-1e42-4b2a-b667-3242b0ace034.wav"        # or "sample.mp3"
-MAX_TOKENS_PRIMARY = 8000        # raise to help finish
+MAX_TOKENS_PRIMARY = 16000       # near the model's output cap, so one call usually finishes
 MAX_TOKENS_CONTINUE = 9000       # one-time continuation budget
 TEMPERATURE = 0
+STREAM = True                    # stream output so it is echoed as it arrives
+HTTP_KEEPALIVE_SECONDS = 120     # keep idle connections warm for the continuation / next GUI run
+B64_CHUNK_SIZE = 48 * 1024       # multiple of 3, so no padding mid-stream
+HASH_CHUNK_SIZE = 1024 * 1024    # large updates let hashlib release the GIL for longer
+TRANSCODE_WAV_TO_MP3 = True      # shrink WAV uploads with ffmpeg (when on PATH) before base64
+MP3_BITRATE = "96k"              # mono, voice-friendly
 # ==========================
 
 BASE_DIR = pathlib.Path(__file__).resolve().parent
 RESULTS_DIR = BASE_DIR / "Results"
+CACHE_DIR = BASE_DIR / "cache"
 
 
 # ---------- File & audio helpers ----------
-def encode_audio_for_api(path: str) -> Tuple[str, str]:
-    """Return (format, base64_data) for .wav or .mp3 file."""
+def validate_audio_path(path: str) -> Tuple[pathlib.Path, str]:
+    """Return (path, format) for an existing .wav or .mp3 file; exit otherwise."""
     p = pathlib.Path(path)
     if not p.exists():
         sys.exit(f"[!] Audio file not found: {p.resolve()}")
     fmt = p.suffix.lower().lstrip(".")
     if fmt not in {"wav", "mp3"}:
         sys.exit("[!] Use a .wav or .mp3 file for input_audio.")
+    return p, fmt
+
+def transcode_to_mp3(p: pathlib.Path, cancel: Optional[threading.Event] = None) -> Optional[bytes]:
+    """Return mono MP3 bytes for p via ffmpeg, or None if ffmpeg is unavailable, fails or is cancelled."""
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        return None
+    cmd = [ffmpeg, "-nostdin", "-loglevel", "error", "-i", str(p),
+           "-ac", "1", "-b:a", MP3_BITRATE, "-f", "mp3", "pipe:1"]
+    try:
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),  # no console flash under the GUI on Windows
+        )
+    except OSError:
+        proc = None
+    else:
+        while True:
+            try:
+                mp3, _ = proc.communicate(timeout=0.1)
+                break
+            except subprocess.TimeoutExpired:
+                if cancel is not None and cancel.is_set():
+                    proc.kill()
+                    proc.communicate()
+                    return None
+    if proc is None or proc.returncode != 0:
+        print(f"[warning] ffmpeg could not transcode {p.name}; uploading the WAV as-is.")
+        return None
+    return mp3 or None
+
+def encode_audio_for_api(path: str, cancel: Optional[threading.Event] = None) -> Optional[Tuple[str, str]]:
+    """
+    Return (format, base64_data) for .wav or .mp3 file (WAV is sent as MP3 when possible).
+    Returns None early if cancel is set while encoding (e.g. the result turned out to be cached).
+    """
+    p, fmt = validate_audio_path(path)
+    if fmt == "wav" and TRANSCODE_WAV_TO_MP3:
+        mp3 = transcode_to_mp3(p, cancel)
+        if mp3 is not None:
+            return "mp3", b64codec.b64encode(mp3).decode("ascii")
+        if cancel is not None and cancel.is_set():
+            return None
+    # Encode in fixed-size chunks so the raw file is never held in memory whole.
+    # readinto() refills one reusable buffer (no bytes object per chunk) and the
+    # output is preallocated to the exact encoded size from the file size.
+    size = p.stat().st_size
+    out = bytearray(4 * ((size + 2) // 3))
+    buf = bytearray(B64_CHUNK_SIZE)
+    view = memoryview(buf)
+    pos = 0
     with open(p, "rb") as f:
-        b64 = base64.b64encode(f.read()).decode("utf-8")
+        while n := f.readinto(buf):
+            if cancel is not None and cancel.is_set():
+                return None
+            encoded = b64codec.b64encode(view[:n])
+            out[pos : pos + len(encoded)] = encoded
+            pos += len(encoded)
+    del out[pos:]  # only trims if the file shrank after stat()
+    b64 = out.decode("ascii")
     return fmt, b64
 
+def build_audio_part(fmt: str, b64: str) -> dict:
+    """Wrap encoded audio in the input_audio content part, built once per run and reused."""
+    return {"type": "input_audio", "input_audio": {"data": b64, "format": fmt}}
+
 
 # ---------- Response text extraction ----------
 def extract_text_from_response(resp) -> str:
@@ -37,16 +120,18 @@ def extract_text_from_response(resp) -> str:
       - fallback transcript inside message.audio.transcript (rare)
     """
     msg = resp.choices[0].message
+    content = getattr(msg, "content", None)
 
-    # Case A: plain string
-    if isinstance(getattr(msg, "content", None), str) and msg.content.strip():
-        return msg.content.strip()
+    # Case A: plain string (by far the most common, so checked first and cheaply)
+    if type(content) is str:
+        text = content.strip()
+        if text:
+            return text
 
     # Case B: content parts
-    parts = getattr(msg, "content", None)
-    if isinstance(parts, list):
+    elif isinstance(content, list):
         texts = []
-        for part in parts:
+        for part in content:
             if isinstance(part, dict) and isinstance(part.get("text"), str):
                 texts.append(part["text"])
             elif hasattr(part, "text") and isinstance(part.text, str):
@@ -62,38 +147,103 @@ def extract_text_from_response(resp) -> str:
     return ""
 
 
+def extract_text_from_delta(delta) -> str:
+    """Text carried by one streamed chunk: content, or the audio transcript when the model speaks."""
+    content = getattr(delta, "content", None)
+    if content:
+        return content
+    audio_field = getattr(delta, "audio", None)
+    if isinstance(audio_field, dict):
+        return audio_field.get("transcript") or ""
+    return getattr(audio_field, "transcript", None) or ""
+
+
+def collect_stream(stream) -> Tuple[str, str]:
+    """Drain a streamed completion, echoing text as it arrives; return (text, finish_reason)."""
+    chunks = []  # joined once at the end rather than growing a string per delta
+    finish = ""
+    for event in stream:
+        if not event.choices:
+            continue
+        choice = event.choices[0]
+        piece = extract_text_from_delta(choice.delta)
+        if piece:
+            chunks.append(piece)
+            print(piece, end="", flush=True)
+        if choice.finish_reason:
+            finish = choice.finish_reason
+    print(flush=True)
+    return "".join(chunks).strip(), finish
+
+
+def read_completion(resp) -> Tuple[str, str]:
+    """Return (text, finish_reason) for a response created with stream=STREAM."""
+    if STREAM:
+        return collect_stream(resp)
+    return extract_text_from_response(resp), getattr(resp.choices[0], "finish_reason", "")
+
+
 # ---------- JSON parsing & saving ----------
+def json_loads(text):
+    """Decode JSON from str or bytes, preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+def json_dumps_bytes(payload, indent: bool = True) -> bytes:
+    """Encode payload as UTF-8 JSON bytes (non-ASCII kept as-is), preferring orjson."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(payload, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
+
+_BRACE_RE = re.compile(r"[{}]")
+_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL | re.IGNORECASE)
+_CTRL_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+_TRAILING_COMMA_RE = re.compile(r",(\s*[}\]])")
+
 def _balanced_json_block(s: str) -> Optional[str]:
     """Try to extract the largest top-level {...} block (handles extra prose)."""
     start = s.find("{")
     if start == -1:
         return None
+    # The regex engine skips the non-brace text in C; only braces reach Python.
     depth = 0
-    for i in range(start, len(s)):
-        c = s[i]
-        if c == "{":
+    for m in _BRACE_RE.finditer(s, start):
+        if m.group() == "{":
             depth += 1
-        elif c == "}":
+        else:
             depth -= 1
             if depth == 0:
-                return s[start : i + 1]
+                return s[start : m.end()]
     return None
 
+def _normalize_json_str(s: str) -> str:
+    """Strip code fences, stray control characters and trailing commas from model output."""
+    s = s.strip().removeprefix("```json").removeprefix("```").removesuffix("```").strip()
+    s = _CTRL_RE.sub("", s)
+    return _TRAILING_COMMA_RE.sub(r"\1", s)
+
 def parse_json_or_raise(text: str):
     """Attempt to parse JSON robustly; raise if impossible."""
-    # direct
+    # direct (valid output is never rewritten)
+    try:
+        return json_loads(text)
+    except Exception:
+        pass
+    # normalized: every failed parse costs a continuation round-trip
+    text = _normalize_json_str(text or "")
     try:
-        return json.loads(text)
+        return json_loads(text)
     except Exception:
         pass
     # balanced block
     block = _balanced_json_block(text)
     if block:
-        return json.loads(block)
+        return json_loads(block)
     # fenced code (rare)
-    m = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", text, re.DOTALL | re.IGNORECASE)
+    m = _FENCE_RE.search(text)
     if m:
-        return json.loads(m.group(1))
+        return json_loads(m.group(1))
     raise ValueError("Could not parse JSON from model output.")
 
 def ensure_results_dir() -> pathlib.Path:
@@ -110,19 +260,66 @@ def result_paths_for_audio(audio_path: str) -> Tuple[pathlib.Path, pathlib.Path,
     continuation_path = directory / f"{base}_raw_continuation.txt"
     return json_path, raw_path, continuation_path
 
-def save_json(payload, dest_path: pathlib.Path) -> str:
-    """Persist parsed JSON to the provided path."""
+def write_bytes_atomic(data: bytes, dest_path: pathlib.Path) -> str:
+    """Write data in one call to a temp file, then os.replace it over dest_path.
+
+    Readers never see a half-written file; no fsync, since these are re-creatable outputs.
+    """
     dest_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(dest_path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
+    tmp_path = dest_path.with_name(dest_path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, dest_path)
     return str(dest_path)
 
+def save_json(payload, dest_path: pathlib.Path) -> str:
+    """Persist parsed JSON to the provided path."""
+    return write_bytes_atomic(json_dumps_bytes(payload), dest_path)
+
 def save_raw_text(text: str, dest_path: pathlib.Path) -> str:
     """Persist raw text (partial or continuation) to the provided path."""
-    dest_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(dest_path, "w", encoding="utf-8") as f:
-        f.write(text or "")
-    return str(dest_path)
+    return write_bytes_atomic((text or "").encode("utf-8"), dest_path)
+
+# ---------- Result cache ----------
+def audio_sha256(path: str) -> str:
+    """Return the SHA-256 hex digest of the audio file."""
+    p, _ = validate_audio_path(path)
+    digest = hashlib.sha256()
+    with open(p, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def upload_variant(src_fmt: str, sent_fmt: Optional[str] = None) -> str:
+    """
+    Describe what the model receives for a source file, e.g. "wav" or "mp3@96k".
+    With sent_fmt=None, describe what it is expected to receive (WAV is transcoded
+    when enabled and ffmpeg is on PATH).
+    """
+    if sent_fmt is None:
+        transcode = src_fmt == "wav" and TRANSCODE_WAV_TO_MP3 and shutil.which("ffmpeg") is not None
+        sent_fmt = "mp3" if transcode else src_fmt
+    if src_fmt == "wav" and sent_fmt == "mp3":
+        return f"mp3@{MP3_BITRATE}"
+    return sent_fmt
+
+def audio_cache_key(digest: str, variant: str) -> str:
+    """Key a result by the audio digest plus a fingerprint of the model, prompts and upload variant."""
+    prompt_id = hashlib.sha1(f"{MODEL}\n{variant}\n{SYSTEM_JSON_MODE}\n{RUBRIC_PROMPT}".encode("utf-8")).hexdigest()[:8]
+    return f"{digest}_{prompt_id}"
+
+def load_cached_result(key: str):
+    """Return the cached parsed JSON for key, or None on a miss."""
+    cache_path = CACHE_DIR / f"{key}.json"
+    try:
+        with open(cache_path, "rb") as f:
+            return json_loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+def store_cached_result(key: str, payload) -> None:
+    """Atomically write payload to the cache so a crash never leaves a torn entry."""
+    write_bytes_atomic(json_dumps_bytes(payload, indent=False), CACHE_DIR / f"{key}.json")
 
 # ---------- Prompts ----------
 SYSTEM_JSON_MODE = (
@@ -178,88 +375,164 @@ Overall Impression / Professional Readiness: 1 Unprepared ... 7 Exceptional; ind
 Performance Consistency / Stamina: 1 Highly inconsistent ... 7 Rock-solid; last take as strong as first
 Listener Engagement / Empathic Resonance: 1 Disengaging ... 7 Compelling/affecting; sustained immersion
 """
+# Normalize once at import so every request (and the cache fingerprint) uses the compact form.
+RUBRIC_PROMPT = re.sub(r"[ \t]+\n", "\n", RUBRIC_PROMPT).strip()
+
+# Metric names as listed in the rubric, and a pattern per metric that finds its score in
+# (possibly truncated) model output.
+METRIC_NAMES = tuple(re.findall(r"^([^\[\n][^:\n]*): 1 ", RUBRIC_PROMPT, re.MULTILINE))
+_METRIC_SCORE_RES = {
+    name: re.compile(rf'"{re.escape(name)}"\s*:\s*\{{\s*"score"\s*:\s*\d')
+    for name in METRIC_NAMES
+}
+
+# Used when every metric is already scored: only close/repair the JSON, no audio needed.
+CONTINUATION_REPAIR_INSTRUCTION = (
+    "You previously returned a PARTIAL or malformed JSON object. "
+    "The audio is not attached again, so do not add or re-score any metric. "
+    "Only close or repair that JSON: keep every existing key and value exactly as it is. "
+    "Return ONLY valid JSON. No prose."
+)
+# Used when some metrics were never scored: the audio is re-attached so they can be.
+CONTINUATION_COMPLETE_INSTRUCTION = (
+    "You previously returned a PARTIAL JSON object. The audio is attached again. "
+    "Return a SINGLE, COMPLETE JSON object that merges and completes the result: keep the existing scores "
+    "and score the missing metrics from the attached audio. "
+    "Do not repeat duplicate keys. Ensure the final JSON includes all required fields and 26 rubric metrics. "
+    "Return ONLY valid JSON. No prose."
+)
+
+# Message pieces shared by every request, built once and reused.
+SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_JSON_MODE}
+RUBRIC_PART = {"type": "text", "text": RUBRIC_PROMPT}
+CONTINUATION_REPAIR_PART = {"type": "text", "text": CONTINUATION_REPAIR_INSTRUCTION}
+CONTINUATION_COMPLETE_PART = {"type": "text", "text": CONTINUATION_COMPLETE_INSTRUCTION}
+
+
+def scored_metrics(text: str) -> set:
+    """Rubric metrics whose score already appears in the (possibly truncated) model output."""
+    return {name for name, pattern in _METRIC_SCORE_RES.items() if pattern.search(text)}
 
 
 # ---------- Core call ----------
-def call_model(client: OpenAI, fmt: str, b64: str, max_tokens: int):
+def audio_output_config() -> dict:
+    """Audio output settings; streamed audio must be pcm16, otherwise keep wav."""
+    return {"voice": "alloy", "format": "pcm16" if STREAM else "wav"}
+
+
+def call_model(client: OpenAI, audio_part: dict, max_tokens: int):
     return client.chat.completions.create(
         model=MODEL,
         modalities=["text", "audio"],                  # sending audio, so include "audio"
-        audio={"voice": "alloy", "format": "wav"},     # required by audio-preview models
+        audio=audio_output_config(),                   # required by audio-preview models
         messages=[
-            {"role": "system", "content": SYSTEM_JSON_MODE},
+            SYSTEM_MESSAGE,
             {
                 "role": "user",
                 "content": [
-                    {"type": "text", "text": RUBRIC_PROMPT},
-                    {"type": "input_audio", "input_audio": {"data": b64, "format": fmt}},
+                    RUBRIC_PART,
+                    audio_part,
                 ],
             },
         ],
         # NOTE: response_format not supported by this model
         temperature=TEMPERATURE,
         max_tokens=max_tokens,
+        stream=STREAM,
     )
 
 
-def continue_if_truncated(client: OpenAI, fmt: str, b64: str, partial_text: str, max_tokens: int):
+def continue_if_truncated(client: OpenAI, partial_text: str, max_tokens: int, audio_part: Optional[dict] = None):
     """
     One-time continuation request if the first reply hit the length limit or was unparsable.
     We feed back the partial JSON and ask for a COMPLETE JSON object.
+    Pass audio_part when metrics are still unscored so the model can hear what it rates;
+    without it the model is only asked to close/repair the JSON, which saves re-uploading
+    the full base64 blob. The rubric is always sent: each chat completion is stateless.
     """
-    continuation_instruction = (
-        "You previously returned a PARTIAL JSON object. "
-        "Return a SINGLE, COMPLETE JSON object that merges and completes the result. "
-        "Do not repeat duplicate keys. Ensure the final JSON includes all required fields and 26 rubric metrics. "
-        "Return ONLY valid JSON. No prose."
-    )
+    if audio_part is not None:
+        content = [RUBRIC_PART, audio_part, CONTINUATION_COMPLETE_PART]
+    else:
+        content = [RUBRIC_PART, CONTINUATION_REPAIR_PART]
+    content.append({"type": "text", "text": f"PARTIAL_JSON_START\n{partial_text}\nPARTIAL_JSON_END"})
     return client.chat.completions.create(
         model=MODEL,
         modalities=["text", "audio"],
-        audio={"voice": "alloy", "format": "wav"},
+        audio=audio_output_config(),
         messages=[
-            {"role": "system", "content": SYSTEM_JSON_MODE},
-            {
-                "role": "user",
-                "content": [
-                    {"type": "text", "text": RUBRIC_PROMPT},
-                    {"type": "input_audio", "input_audio": {"data": b64, "format": fmt}},
-                ],
-            },
-            {
-                "role": "user",
-                "content": [
-                    {"type": "text", "text": continuation_instruction},
-                    {"type": "text", "text": f"PARTIAL_JSON_START\n{partial_text}\nPARTIAL_JSON_END"},
-                ],
-            },
+            SYSTEM_MESSAGE,
+            {"role": "user", "content": content},
         ],
         temperature=TEMPERATURE,
         max_tokens=max_tokens,
+        stream=STREAM,
     )
 
 
 # ---------- Main ----------
-if __name__ == "__main__":
-
-    parser = argparse.ArgumentParser(description="Run the Voices Performance Rubric analysis.")
-    parser.add_argument("-a", "--audio", default=AUDIO_PATH, help="Path to a .wav or a .mp3 file to analyze.")
-    args = parser.parse_args()
-    audio_path = args.audio or AUDIO_PATH
-    json_dest, raw_dest, raw_cont_dest = result_paths_for_audio(audio_path)
-    # API key
+def create_client() -> OpenAI:
+    """Build the OpenAI client from OPENAI_API_KEY; exit with a message if it is missing."""
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         sys.exit("[!] OPENAI_API_KEY is not set for this shell/session.")
-    client = OpenAI(api_key=api_key)
+    # One explicit connection pool, so the continuation call (and later worker runs) reuse
+    # the warm TCP/TLS connection. HTTP/2 only when the optional h2 package is installed.
+    # DefaultHttpxClient keeps the SDK's own defaults (timeouts, redirects) for everything else.
+    http_client = DefaultHttpxClient(
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=HTTP_KEEPALIVE_SECONDS),
+    )
+    return OpenAI(api_key=api_key, http_client=http_client)
+
 
-    # Audio
-    fmt, b64 = encode_audio_for_api(audio_path)
+def analyze(audio_path: str, client: Optional[OpenAI] = None, use_cache: bool = True) -> int:
+    """
+    Score one audio file and save the JSON result; return a process-style exit code.
+    Pass a long-lived client to reuse its connection pool across runs (see worker.py);
+    otherwise one is created only if the cache misses.
+    """
+    _, src_fmt = validate_audio_path(audio_path)
+    json_dest, raw_dest, raw_cont_dest = result_paths_for_audio(audio_path)
+
+    # Hash and encode at the same time: the upload payload (base64, or an ffmpeg
+    # transcode) is built on a background thread while this thread computes the cache
+    # key; hashlib releases the GIL, so wall time is roughly the slower of the two.
+    cancel_encode = threading.Event()
+    audio_part = None
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pending_audio = pool.submit(encode_audio_for_api, audio_path, cancel_encode)
+        try:
+            # Cache lookup: identical audio + prompts + upload format never needs another model call
+            digest = audio_sha256(audio_path)
+            cache_key = audio_cache_key(digest, upload_variant(src_fmt))
+            cached = load_cached_result(cache_key) if use_cache else None
+            if cached is None:
+                fmt, b64 = pending_audio.result()
+                sent_key = audio_cache_key(digest, upload_variant(src_fmt, fmt))
+                if sent_key != cache_key:
+                    # the transcode fell back to the original WAV: key by what is actually sent
+                    cache_key = sent_key
+                    cached = load_cached_result(cache_key) if use_cache else None
+                if cached is None:
+                    # Audio (only the prebuilt content part keeps a reference to the base64 string)
+                    audio_part = build_audio_part(fmt, b64)
+        finally:
+            cancel_encode.set()  # no-op once encoding finished; otherwise stops it early
+
+    if audio_part is None:
+        json_path = save_json(cached, json_dest)
+        print(f"[cache] Reusing previous analysis of this audio (key {cache_key[:12]}).")
+        print(f"\nSaved JSON to: {json_path}")
+        return 0
+
+    # API key
+    if client is None:
+        client = create_client()
 
     # Primary call
-    resp = call_model(client, fmt, b64, MAX_TOKENS_PRIMARY)
-    finish = getattr(resp.choices[0], "finish_reason", "")
-    text = extract_text_from_response(resp)
+    if STREAM:
+        print("[stream] Model output:")
+    text, finish = read_completion(call_model(client, audio_part, MAX_TOKENS_PRIMARY))
 
     # Try to parse
     parsed = None
@@ -273,12 +546,21 @@ if __name__ == "__main__":
     # If truncated or unparsable, do a one-time continuation attempt
     if parsed is None or finish == "length":
         print("[info] Attempting continuation to complete JSON...")
-        resp2 = continue_if_truncated(client, fmt, b64, text or "", MAX_TOKENS_CONTINUE)
-        text2 = extract_text_from_response(resp2)
+        # Re-attach the audio only if some metrics were never scored; otherwise just repair.
+        scored = scored_metrics(text or "")
+        missing = [name for name in METRIC_NAMES if name not in scored]
+        if missing:
+            print(f"[info] {len(missing)} metric(s) not scored yet; re-attaching the audio.")
+        cont_audio = audio_part if missing else None
+        text2, finish2 = read_completion(continue_if_truncated(client, text or "", MAX_TOKENS_CONTINUE, cont_audio))
         try:
             parsed = parse_json_or_raise(text2)
             text = text2  # use the completed text for preview
-            finish2 = getattr(resp2.choices[0], "finish_reason", "")
+            if cont_audio is None:
+                scores = parsed.get("scores") if isinstance(parsed, dict) else None
+                unheard = [name for name in scores if name not in scored] if isinstance(scores, dict) else []
+                if unheard:
+                    print(f"[warning] These metrics were scored without the audio attached: {', '.join(unheard)}")
             if finish2 == "length":
                 print("[warning] Continuation was also cut off (length). Consider increasing MAX_TOKENS_CONTINUE or tightening output.")
         except Exception:
@@ -286,14 +568,26 @@ if __name__ == "__main__":
             raw2_path = save_raw_text(text2, raw_cont_dest)
             print("[!] Could not parse JSON even after continuation.")
             print(f"[i] Raw continuation saved to: {raw2_path}")
-            sys.exit(1)
+            return 1
 
     # Save JSON (CSV removed as requested)
     json_path = save_json(parsed, json_dest)
+    store_cached_result(cache_key, parsed)
     print(f"\nSaved JSON to: {json_path}")
 
-    # Quick preview for console
+    # Quick preview for console (streamed output was already echoed as it arrived)
     print("\n[debug] finish_reason (first call):", finish)
-    preview = (text or "").strip()
-    print("\nModel analysis (truncated preview):")
-    print(preview[:1200], "..." if len(preview) > 1200 else "")
+    if not STREAM:
+        preview = (text or "").strip()
+        print("\nModel analysis (truncated preview):")
+        print(preview[:1200], "..." if len(preview) > 1200 else "")
+    return 0
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Run the Voices Performance Rubric analysis.")
+    parser.add_argument("-a", "--audio", default=AUDIO_PATH, help="Path to a .wav or a .mp3 file to analyze.")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore cached results and always call the model.")
+    args = parser.parse_args()
+    sys.exit(analyze(args.audio or AUDIO_PATH, use_cache=not args.no_cache))
@@ -0,0 +1,74 @@
+"""
+Long-lived analysis worker used by gui.py.
+
+Reads one JSON request per line on stdin, e.g. {"audio": "take1.wav"}, and runs the
+same analysis as run.py. The interpreter, imports and OpenAI client (with its warm
+HTTPS connection pool) stay alive between requests. Everything is reported on stdout
+as JSON lines:
+  {"event": "ready"}
+  {"event": "output", "text": "..."}    console output of the analysis
+  {"event": "done", "exit_code": 0}
+"""
+import contextlib
+import io
+import json
+import os
+import sys
+import traceback
+
+import run
+
+
+def emit(stream, event: dict) -> None:
+    stream.write(json.dumps(event) + "\n")
+    stream.flush()
+
+
+class EventWriter(io.TextIOBase):
+    """Text stream that forwards everything written to it as output events."""
+
+    def __init__(self, stream) -> None:
+        self.stream = stream
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if text:
+            emit(self.stream, {"event": "output", "text": text})
+        return len(text)
+
+
+def handle_request(line: str, client):
+    """Run one request; return (exit_code, client) so a newly created client is kept."""
+    try:
+        request = json.loads(line)
+        if client is None and os.getenv("OPENAI_API_KEY"):
+            client = run.create_client()
+        return run.analyze(request["audio"], client=client, use_cache=not request.get("no_cache")), client
+    except SystemExit as exc:
+        # run.py helpers exit with a message on bad input; report it and keep serving
+        if isinstance(exc.code, str):
+            print(exc.code)
+            return 1, client
+        return exc.code or 0, client
+    except Exception:
+        traceback.print_exc()
+        return 1, client
+
+
+def main() -> None:
+    out = sys.stdout
+    writer = EventWriter(out)
+    client = None
+    emit(out, {"event": "ready"})
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        with contextlib.redirect_stdout(writer), contextlib.redirect_stderr(writer):
+            exit_code, client = handle_request(line, client)
+        emit(out, {"event": "done", "exit_code": exit_code})
+
+
+if __name__ == "__main__":
+    main()